@@ -1,69 +1,141 @@
 import streamlit as st
-import plotly.express as px
-import pandas as pd
-import gspread
 import requests
-from oauth2client.service_account import ServiceAccountCredentials
+from bisect import bisect_left
+
+# Question data and precomputed lookups live in questions.py so every
+# rerun gets them from the sys.modules cache
+from questions import SURVEY_QUESTIONS as survey_questions, SCORE_LUT as _SCORE_LUT, LABELS as _LABELS
+
+# gspread/google-auth are deferred into the function that needs them —
+# the survey reruns never pay their import cost
+
+# Shared pool so the Mailjet notification doesn't block the rerun —
+# the user doesn't need to wait on the internal email
+@st.cache_resource
+def _mail_pool():
+    from concurrent.futures import ThreadPoolExecutor
+    return ThreadPoolExecutor(max_workers=2)
+
+# Pooled session with keep-alive so repeat submissions reuse the
+# TCP/TLS connection instead of handshaking every time
+@st.cache_resource
+def _http():
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=4)
+    session.mount("https://", adapter)
+    return session
+
+# Credentials and the constant parts of the payload resolved once —
+# each send only fills in the TextPart
+@st.cache_resource
+def _mj_template():
+    mj = st.secrets["mailjet"]
+    return {
+        "auth": (mj["api_key"], mj["api_secret"]),
+        "base": {
+            "Messages": [
+                {
+                    "From": {
+                        "Email": mj["from_email"],
+                        "Name": mj["from_name"]
+                    },
+                    "To": [
+                        {
+                            "Email": mj["from_email"],
+                            "Name": "Survey Notification"
+                        }
+                    ],
+                    "Subject": "New Data Maturity Survey Submission"
+                }
+            ]
+        }
+    }
 
 def send_mailjet_email(name, email, score, tier):
-    api_key = st.secrets["mailjet"]["api_key"]
-    api_secret = st.secrets["mailjet"]["api_secret"]
-    from_email = st.secrets["mailjet"]["from_email"]
-    from_name = st.secrets["mailjet"]["from_name"]
-
-    payload = {
-        "Messages": [
-            {
-                "From": {
-                    "Email": from_email,
-                    "Name": from_name
-                },
-                "To": [
-                    {
-                        "Email": from_email,
-                        "Name": "Survey Notification"
-                    }
-                ],
-                "Subject": "New Data Maturity Survey Submission",
-                "TextPart": f"""A new lead completed the survey:
+    import copy
+
+    template = _mj_template()
+    payload = copy.deepcopy(template["base"])
+    payload["Messages"][0]["TextPart"] = f"""A new lead completed the survey:
 
 Name: {name}
 Email: {email}
 Score: {score}
 Tier: {tier}
 """
-            }
-        ]
-    }
 
-    response = requests.post(
-        "https://api.mailjet.com/v3.1/send",
-        auth=(api_key, api_secret),
-        json=payload
-    )
+    # Runs on a background thread after the rerun has finished, so log
+    # failures instead of rendering them — an uncaught timeout or
+    # connection error would otherwise vanish as an unobserved future
+    try:
+        response = _http().post(
+            "https://api.mailjet.com/v3.1/send",
+            auth=template["auth"],
+            json=payload,
+            timeout=5
+        )
+    except requests.RequestException as e:
+        print(f"Mailjet request failed: {e}")
+        return
 
-    if response.status_code == 200:
-        st.success("📬 Email notification sent to Sidekick Media!")
-    else:
-        st.error(f"❌ Mailjet error: {response.status_code} - {response.text}")
+    if response.status_code != 200:
+        print(f"Mailjet error: {response.status_code} - {response.text}")
 
 # Connect to Google Sheets
 @st.cache_resource
 def get_gsheet_client():
-    scope = [
-        "https://spreadsheets.google.com/feeds",
-        "https://www.googleapis.com/auth/drive"
-    ]
-    creds = ServiceAccountCredentials.from_json_keyfile_dict(
-        st.secrets["gcp_service_account"], scope
+    import gspread
+    from google.oauth2.service_account import Credentials
+
+    creds = Credentials.from_service_account_info(
+        st.secrets["gcp_service_account"],
+        scopes=[
+            "https://www.googleapis.com/auth/spreadsheets",
+            "https://www.googleapis.com/auth/drive"
+        ]
     )
     client = gspread.authorize(creds)
     return client
 
+# Cache the leads worksheet handle so each submission skips the
+# title-based Drive search that client.open() performs
+@st.cache_resource
+def get_leads_worksheet():
+    client = get_gsheet_client()
+    return client.open_by_key(st.secrets["sheets"]["leads_id"]).sheet1
+
+# Retry transient Sheets errors (quota 429s, 5xx blips) with
+# exponential backoff + jitter so they don't burn a submission
+def _retrying_append(ws, rows, tries=4):
+    import time
+    import random
+    import gspread
+
+    for i in range(tries):
+        try:
+            # RAW skips Sheets' server-side formula/date coercion and the
+            # explicit range pins the append to the lead table
+            return ws.append_rows(
+                rows,
+                value_input_option="RAW",
+                insert_data_option="INSERT_ROWS",
+                table_range="A1"
+            )
+        except gspread.exceptions.APIError as e:
+            if e.response.status_code not in (429, 500, 503) or i == tries - 1:
+                raise
+            time.sleep((2 ** i) + random.random())
+
+# Cache the logo bytes so reruns skip the disk read + re-encode
+@st.cache_data
+def _logo_bytes():
+    with open("Sidekick Media - Logo.png", "rb") as f:
+        return f.read()
+
 # App config
 st.set_page_config(page_title="Data Maturity Survey", layout="centered")
 with st.sidebar:
-    st.image("Sidekick Media - Logo.png", width=150)
+    st.image(_logo_bytes(), width=150)
     st.markdown("### Data Maturity Survey")
     st.markdown(
     """
@@ -90,83 +162,21 @@ with st.sidebar:
     unsafe_allow_html=True
 )
 
-# Questions 
-survey_questions = [
-    {
-        "domain": "Strategy & Leadership",
-        "question": "Does your organisation have a documented, reviewed data strategy?",
-        "options": [
-            ("No strategy at all", 1),
-            ("Informal ideas but nothing documented", 2),
-            ("A documented strategy exists but isn’t well used", 3),
-            ("We have a clear, reviewed data strategy aligned to business goals", 4),
-        ]
-    },
-    {
-        "domain": "People & Skills",
-        "question": "How would you rate your team’s data literacy and confidence?",
-        "options": [
-            ("Most people are uncomfortable with data", 1),
-            ("Some people are learning, but skills are patchy", 2),
-            ("Teams can interpret dashboards, but not build them", 3),
-            ("Teams are confident using data tools and making decisions", 4),
-        ]
-    },
-    {
-        "domain": "Tools & Infrastructure",
-        "question": "What best describes your data infrastructure?",
-        "options": [
-            ("Data is stored in spreadsheets and scattered systems", 1),
-            ("We have some cloud tools but no integration", 2),
-            ("We use a centralised data platform (e.g. data warehouse)", 3),
-            ("Our tools are integrated, scalable, and automated", 4),
-        ]
-    },
-    {
-        "domain": "Governance & Compliance",
-        "question": "How do you manage data access, quality, and compliance?",
-        "options": [
-            ("No formal policies", 1),
-            ("Some access rules, but not enforced", 2),
-            ("Defined ownership and some monitoring", 3),
-            ("Strong governance with audits, monitoring, and training", 4),
-        ]
-    },
-    {
-        "domain": "Culture & Adoption",
-        "question": "How ingrained is data-driven thinking in your organisation?",
-        "options": [
-            ("Gut feel drives most decisions", 1),
-            ("Some teams use data occasionally", 2),
-            ("Data informs key decisions across functions", 3),
-            ("Data is the foundation for strategy and daily ops", 4),
-        ]
-    },
-    {
-        "domain": "Measurement & Performance",
-        "question": "How do you measure and communicate business performance?",
-        "options": [
-            ("Little or no tracking", 1),
-            ("Basic dashboards/reports", 2),
-            ("Regular reporting but not action-oriented", 3),
-            ("Clear KPIs tracked in real time and discussed weekly", 4),
-        ]
-    },
-    {
-        "domain": "Innovation Readiness",
-        "question": "Are you leveraging AI, automation, or predictive analytics?",
-        "options": [
-            ("Not at all", 1),
-            ("It's on our radar", 2),
-            ("We’re running experiments", 3),
-            ("We actively use smart tools for decision support", 4),
-        ]
-    }
-]
-
-# Session state
-if "responses" not in st.session_state:
-    st.session_state.responses = []
+# Runs as an on_click callback before the rerun, so a single rerun
+# renders the next question — no explicit st.rerun() needed
+def _record_answer(step):
+    q = survey_questions[step]
+    selected = st.session_state[f"q{step}"]
+    st.session_state.scores.append(_SCORE_LUT[step][selected])
+    st.session_state.domains.append(q["domain"])
+    st.session_state.answers.append(selected)
+    st.session_state.step += 1
+
+# Session state — responses kept as parallel lists rather than a list
+# of dicts, so aggregation is a plain loop over the lists
+st.session_state.setdefault("scores", [])
+st.session_state.setdefault("domains", [])
+st.session_state.setdefault("answers", [])
 if "step" not in st.session_state:
     st.session_state.step = 0
 
@@ -177,6 +187,40 @@ st.markdown(
     "and get clear, actionable steps to evolve your strategy."
 )
 
+# Maturity tiers: upper score bound -> (tier label, recommendation),
+# resolved with a bisect lookup instead of an if/elif ladder
+_TIER_BOUNDS = [8, 13, 17]
+_TIERS = [
+    (
+        "📉 Early Stage",
+        "Your business is in the early stages of using data to make decisions. "
+        "Start by auditing your existing data sources and create a simple, actionable data strategy. "
+        "We recommend beginning with high-impact areas like performance tracking and customer insights."
+    ),
+    (
+        "🔧 Foundational",
+        "You’re building a solid foundation. Focus on aligning your data strategy with business goals, "
+        "and invest in reliable dashboards that give visibility into performance and customer behaviour."
+    ),
+    (
+        "📈 Emerging Leader",
+        "You’re on your way to becoming a data-led business. Consider consolidating customer data, "
+        "enhancing marketing measurement, and testing AI-powered tools to scale faster."
+    ),
+    (
+        "🚀 Data-Driven Pro",
+        "Your business is already leveraging data effectively. Now’s the time to explore advanced automation, "
+        "predictive analytics, and custom AI solutions that give you a competitive edge."
+    ),
+]
+
+# Progress percentages per step, precomputed for the fixed question count
+_PROGRESS = tuple(int(i / len(survey_questions) * 100) for i in range(len(survey_questions) + 1))
+
+# Identity field choices, hoisted so reruns don't reallocate the lists
+INDUSTRIES = ["", "Technology", "Retail", "Finance", "Healthcare", "Education", "Manufacturing", "Other"]
+TURNOVERS = ["", "< $1M", "$1M–$5M", "$5M–$20M", "$20M+"]
+
 # Store identity info
 if "name" not in st.session_state:
     st.session_state.name = ""
@@ -191,103 +235,71 @@ if "started" not in st.session_state:
 
 if not st.session_state.started:
     st.subheader("👤 Tell us who you are to begin the survey")
-    st.session_state.name = st.text_input("Your Name")
-    st.session_state.email = st.text_input("Your Work Email")
-    st.session_state.industry = st.selectbox(
-        "Industry",
-        ["", "Technology", "Retail", "Finance", "Healthcare", "Education", "Manufacturing", "Other"]
-    )
-    st.session_state.turnover = st.selectbox(
-        "Annual Turnover (Approx.)",
-        ["", "< $1M", "$1M–$5M", "$5M–$20M", "$20M+"]
-    )
 
-    if all([st.session_state.name, st.session_state.email, st.session_state.industry, st.session_state.turnover]):
-            if st.button("Start Survey"):
-                st.session_state.started = True
-
-                # ✅ Save early details immediately
-                client = get_gsheet_client()
-                sheet = client.open("Data Maturity Leads - Sidekick").sheet1
-                # Append row and estimate the row number
-                sheet.append_row([
-                    st.session_state.name,
-                    st.session_state.email,
-                    st.session_state.industry,
-                    st.session_state.turnover
-                ])
-    
-                # Save row number in session (row count + 1 for 1-based index)
-                st.session_state.row_num = len(sheet.get_all_values())
-
-                st.rerun()
-    else:
-        st.warning("Please complete all fields to begin.")
+    # One form = one rerun on submit, instead of a rerun per keystroke
+    with st.form("identity"):
+        name = st.text_input("Your Name")
+        email = st.text_input("Your Work Email")
+        industry = st.selectbox("Industry", INDUSTRIES)
+        turnover = st.selectbox("Annual Turnover (Approx.)", TURNOVERS)
+        submitted = st.form_submit_button("Start Survey")
+
+    if submitted:
+        if all([name, email, industry, turnover]):
+            st.session_state.update(
+                name=name, email=email, industry=industry, turnover=turnover,
+                started=True
+            )
+
+            # ✅ Keep identity details in session state and write them
+            # together with the results in one batched API call later
+            st.session_state.lead_row = [name, email, industry, turnover]
+
+            st.rerun()
+        else:
+            st.warning("Please complete all fields to begin.")
     st.stop()
-progress = int((st.session_state.step / len(survey_questions)) * 100)
-st.progress(progress)
+st.progress(_PROGRESS[st.session_state.step])
 
 # Survey flow
 if st.session_state.step < len(survey_questions):
-    q = survey_questions[st.session_state.step]
+    step = st.session_state.step
+    q = survey_questions[step]
     st.subheader(q["question"])
-    selected = st.radio("Choose one:", [opt[0] for opt in q["options"]], key=f"q{st.session_state.step}")
-    if st.button("Next", key=f"next{st.session_state.step}"):
-        score = dict(q["options"])[selected]
-        st.session_state.responses.append({
-            "domain": q["domain"],
-            "question": q["question"],
-            "answer": selected,
-            "score": score
-        })
-        st.session_state.step += 1
-        st.rerun()
+    with st.form(f"q{step}_form", clear_on_submit=True):
+        st.radio("Choose one:", _LABELS[step], key=f"q{step}")
+        st.form_submit_button("Next", on_click=_record_answer, args=(step,))
 
 # Show results
 else:
     st.success("🎉 Survey complete! Here's your data maturity snapshot.")
 
-    df = pd.DataFrame(st.session_state.responses)
-    domain_scores = df.groupby("domain")["score"].sum().reset_index()
-
-    total_score = int(df["score"].sum())
+    # Plain dict accumulator — pandas groupby overhead dwarfs the
+    # arithmetic on at most 7 rows
+    scores = {}
+    for domain, score in zip(st.session_state.domains, st.session_state.scores):
+        scores[domain] = scores.get(domain, 0) + score
+    total_score = sum(st.session_state.scores)
 
     # Determine maturity tier
-    if total_score <= 8:
-        tier = "📉 Early Stage"
-        recommendation = (
-            "Your business is in the early stages of using data to make decisions. "
-            "Start by auditing your existing data sources and create a simple, actionable data strategy. "
-            "We recommend beginning with high-impact areas like performance tracking and customer insights."
-        )
-    elif total_score <= 13:
-        tier = "🔧 Foundational"
-        recommendation = (
-            "You’re building a solid foundation. Focus on aligning your data strategy with business goals, "
-            "and invest in reliable dashboards that give visibility into performance and customer behaviour."
-        )
-    elif total_score <= 17:
-        tier = "📈 Emerging Leader"
-        recommendation = (
-            "You’re on your way to becoming a data-led business. Consider consolidating customer data, "
-            "enhancing marketing measurement, and testing AI-powered tools to scale faster."
-        )
-    else:
-        tier = "🚀 Data-Driven Pro"
-        recommendation = (
-            "Your business is already leveraging data effectively. Now’s the time to explore advanced automation, "
-            "predictive analytics, and custom AI solutions that give you a competitive edge."
-        )
+    tier, recommendation = _TIERS[bisect_left(_TIER_BOUNDS, total_score)]
+
+    # Write the merged lead row (identity, score, tier, Q/A pairs) in one
+    # batched API call as soon as the survey completes — the guard keeps
+    # reruns from the CTA widgets below from appending duplicates
+    if not st.session_state.setdefault("lead_written", False):
+        full_row = st.session_state.lead_row + [total_score, tier]
+        for q, answer in zip(survey_questions, st.session_state.answers):
+            full_row.append(q["question"])
+            full_row.append(answer)
+
+        _retrying_append(get_leads_worksheet(), [full_row])
+        st.session_state.lead_written = True
 
-    # Visuals
-    fig = px.scatter(domain_scores,
-                     x="domain",
-                     y="score",
-                     size="score",
-                     color="domain",
-                     size_max=60,
-                     title="🫧 Data Maturity by Domain")
-    st.plotly_chart(fig, use_container_width=True)
+    # Visuals — Streamlit's built-in Vega-Lite chart renders without
+    # shipping Plotly's multi-MB JS bundle to the browser
+    st.markdown("#### 📊 Data Maturity by Domain")
+    st.bar_chart(scores)
 
     st.markdown(f"## 🧠 Your Maturity Tier: **{tier}**")
     st.caption(f"Total Score: {total_score} out of {len(survey_questions) * 4}")
@@ -306,26 +318,8 @@ else:
             if name and email:
                 st.success("✅ Thanks! We'll reach out to you shortly.")
 
-                # Save to Google Sheet
-                # Load the same worksheet again
-                client = get_gsheet_client()
-                sheet = client.open("Data Maturity Leads - Sidekick").sheet1
-                row_num = st.session_state.row_num
-
-                # Update Score (column 5) and Tier (column 6)
-                sheet.update_cell(row_num, 5, total_score)  # Column E
-                sheet.update_cell(row_num, 6, tier)         # Column F
-
-                # Now loop through Q/A pairs starting from column 7 (G)
-                col = 7
-                for r in st.session_state.responses:
-                    sheet.update_cell(row_num, col, r["question"])
-                    col += 1
-                    sheet.update_cell(row_num, col, r["answer"])
-                    col += 1
-
-                # Send email notification
-                send_mailjet_email(st.session_state.name,st.session_state.email,total_score,tier)
+                # Send email notification in the background
+                _mail_pool().submit(send_mailjet_email, name, email, total_score, tier)
 
             else:
                 st.error("Please enter your name and email.")
@@ -0,0 +1,80 @@
+# Survey question data, lifted out of main.py so reruns get it straight
+# from the sys.modules cache instead of re-parsing a ~70-line literal.
+
+SURVEY_QUESTIONS = (
+    {
+        "domain": "Strategy & Leadership",
+        "question": "Does your organisation have a documented, reviewed data strategy?",
+        "options": [
+            ("No strategy at all", 1),
+            ("Informal ideas but nothing documented", 2),
+            ("A documented strategy exists but isn’t well used", 3),
+            ("We have a clear, reviewed data strategy aligned to business goals", 4),
+        ]
+    },
+    {
+        "domain": "People & Skills",
+        "question": "How would you rate your team’s data literacy and confidence?",
+        "options": [
+            ("Most people are uncomfortable with data", 1),
+            ("Some people are learning, but skills are patchy", 2),
+            ("Teams can interpret dashboards, but not build them", 3),
+            ("Teams are confident using data tools and making decisions", 4),
+        ]
+    },
+    {
+        "domain": "Tools & Infrastructure",
+        "question": "What best describes your data infrastructure?",
+        "options": [
+            ("Data is stored in spreadsheets and scattered systems", 1),
+            ("We have some cloud tools but no integration", 2),
+            ("We use a centralised data platform (e.g. data warehouse)", 3),
+            ("Our tools are integrated, scalable, and automated", 4),
+        ]
+    },
+    {
+        "domain": "Governance & Compliance",
+        "question": "How do you manage data access, quality, and compliance?",
+        "options": [
+            ("No formal policies", 1),
+            ("Some access rules, but not enforced", 2),
+            ("Defined ownership and some monitoring", 3),
+            ("Strong governance with audits, monitoring, and training", 4),
+        ]
+    },
+    {
+        "domain": "Culture & Adoption",
+        "question": "How ingrained is data-driven thinking in your organisation?",
+        "options": [
+            ("Gut feel drives most decisions", 1),
+            ("Some teams use data occasionally", 2),
+            ("Data informs key decisions across functions", 3),
+            ("Data is the foundation for strategy and daily ops", 4),
+        ]
+    },
+    {
+        "domain": "Measurement & Performance",
+        "question": "How do you measure and communicate business performance?",
+        "options": [
+            ("Little or no tracking", 1),
+            ("Basic dashboards/reports", 2),
+            ("Regular reporting but not action-oriented", 3),
+            ("Clear KPIs tracked in real time and discussed weekly", 4),
+        ]
+    },
+    {
+        "domain": "Innovation Readiness",
+        "question": "Are you leveraging AI, automation, or predictive analytics?",
+        "options": [
+            ("Not at all", 1),
+            ("It's on our radar", 2),
+            ("We’re running experiments", 3),
+            ("We actively use smart tools for decision support", 4),
+        ]
+    },
+)
+
+# Precomputed lookups so reruns don't rebuild them per click
+SCORE_LUT = [dict(q["options"]) for q in SURVEY_QUESTIONS]
+LABELS = tuple(tuple(opt[0] for opt in q["options"]) for q in SURVEY_QUESTIONS)
+DOMAINS = tuple(q["domain"] for q in SURVEY_QUESTIONS)